@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+import asyncio
+import os
+from abc import ABC
+from threading import Lock
+from typing import BinaryIO, Set
+from urllib.parse import urlparse
+from urllib.request import url2pathname
+
+from aiohttp import ClientSession, TCPConnector
+
+
+class Backend(ABC):
+    """
+    Source of COG bytes. Opened once for the reader's lifetime and asked for
+    arbitrary byte ranges
+    """
+
+    async def open(self) -> None:
+        """
+        Acquire resources needed for reading
+        """
+
+        raise NotImplementedError
+
+    async def read(self, offset: int, size: int) -> bytes:
+        """
+        Get up to size bytes starting from offset
+        """
+
+        raise NotImplementedError
+
+    async def close(self) -> None:
+        """
+        Release resources acquired in open()
+        """
+
+        raise NotImplementedError
+
+
+class HTTPBackend(Backend):
+    _client: ClientSession
+
+    def __init__(self, url: str):
+        self._url = url
+
+    async def open(self) -> None:
+        # Keep connections alive, so concurrent range requests to the same host
+        # don't pay connection setup each time
+        connector = TCPConnector(
+            limit_per_host=32, keepalive_timeout=60, ttl_dns_cache=300
+        )
+        self._client = ClientSession(connector=connector)
+
+    async def read(self, offset: int, size: int) -> bytes:
+        header = {"Range": f"bytes={offset}-{offset + size - 1}"}
+
+        async with self._client.get(self._url, headers=header) as response:
+            response.raise_for_status()
+            return await response.read()
+
+    async def close(self) -> None:
+        await self._client.close()
+
+
+class FileBackend(Backend):
+    """
+    Local file read in the default executor, so reads don't block the event loop.
+    Positional reads don't share the file position and run concurrently. Where they
+    aren't available (Windows), reads seek and read under the lock
+    """
+
+    _file: BinaryIO
+    _reads: Set[asyncio.Future[bytes]]
+
+    def __init__(self, path: str):
+        self._path = path
+        self._lock = Lock()
+        self._reads = set()
+
+    async def open(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._file = await loop.run_in_executor(None, self._open)
+
+    async def read(self, offset: int, size: int) -> bytes:
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(None, self._read_at, offset, size)
+        self._reads.add(future)
+        future.add_done_callback(self._reads.discard)
+
+        # Shield the read, so it's done only when the thread finishes it even if
+        # the caller is cancelled, and close() can wait for it
+        return await asyncio.shield(future)
+
+    async def close(self) -> None:
+        # Descriptor of the closed file may be reused, so let reads finish first
+        if self._reads:
+            await asyncio.wait(self._reads)
+
+        self._file.close()
+
+    def _open(self) -> BinaryIO:
+        return open(self._path, "rb")
+
+    def _read_at(self, offset: int, size: int) -> bytes:
+        if hasattr(os, "pread"):
+            return os.pread(self._file.fileno(), size, offset)
+
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+
+
+def backend_for_url(url: str) -> Backend:
+    """
+    Choose the backend by URL scheme: file:// URLs are read from the local file
+    system, anything else over HTTP
+    """
+
+    parsed = urlparse(url)
+
+    if parsed.scheme == "file":
+        return FileBackend(url2pathname(parsed.path))
+
+    return HTTPBackend(url)
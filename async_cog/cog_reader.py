@@ -1,32 +1,219 @@
 from __future__ import annotations
 
-from struct import calcsize, pack, unpack
-from typing import Any, Iterator, List, Literal
+import asyncio
+from collections import OrderedDict
+from struct import Struct, calcsize, unpack_from
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Literal,
+    NamedTuple,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import numpy as np
-from aiohttp import ClientSession
+from aiohttp import ClientError, ClientResponseError
 from pydantic import NonNegativeInt, PositiveInt
 
+from async_cog.backends import Backend, backend_for_url
 from async_cog.decoders import DECODERS_MAPPING
 from async_cog.ifd import IFD
 from async_cog.tags import BytesTag, FractionsTag, ListTag, NumberTag, StringTag, Tag
 from async_cog.tags.tag_code import TagCode
+from async_cog.tags.tag_type import TAG_TYPE_SIZES, TAG_TYPES, TagType
+
+# Number of bytes read from the beginning of the file on open. Header and first IFDs
+# of COG are placed there, so they are served from memory without extra requests.
+# See GDAL_INGESTED_BYTES_AT_OPEN in https://gdal.org/drivers/raster/cog.html
+PREFETCH_SIZE = 16384
+
+# Size of TIFF header is 8 bytes and of BigTIFF header is 16 bytes. The latter is
+# read, since the format is known only after parsing the header
+TIFF_HEADER_SIZE = 8
+HEADER_SIZE = 16
+
+# IFD is read with a single request together with its number of tags if it has no
+# more tags than this. 512 covers all realistic COGs
+MAX_EXPECTED_TAGS = 512
+
+# Number of bytes read starting from IFD which isn't in already fetched bytes:
+# speculatively right after the previous IFD, where COGs usually place the next one,
+# or from its pointer. Overview IFDs are parsed from this block without more requests
+IFDS_READ_SIZE = 65536
+
+# Ranges requested within the same event loop tick and separated by no more than this
+# number of bytes are merged into a single request
+MAX_RANGES_GAP = 32768
+
+# Maximum total size in bytes of completed reads kept in memory, so repeated requests
+# of the same byte range don't hit the network again
+READ_CACHE_SIZE = 4 * 1024 * 1024
+
+# Tag data types which Tag can be created for
+SUPPORTED_TAG_TYPES = np.array(list(TAG_TYPES))
+
+
+class _RangeCoalescer:
+    """
+    Collect byte ranges requested within one event loop tick and read each group of
+    close ranges with a single request
+    """
+
+    _pending: List[Tuple[int, int, asyncio.Future[bytes]]]
+    _flush_task: Optional[asyncio.Task[None]]
+
+    def __init__(
+        self,
+        read: Callable[[int, int], Awaitable[bytes]],
+        max_gap: int = MAX_RANGES_GAP,
+    ):
+        self._read = read
+        self._max_gap = max_gap
+        self._pending = []
+        self._flush_task = None
+
+    def queue(self, offset: int, size: int) -> asyncio.Future[bytes]:
+        """
+        Schedule reading of the byte range. All ranges queued before the event loop
+        switches to the next task are read together
+        """
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((offset, size, future))
+
+        if self._flush_task is None:
+            self._flush_task = loop.create_task(self.flush())
+
+        return future
+
+    async def flush(self) -> None:
+        """
+        Sort pending ranges, merge close ones and read every merged group
+        """
+
+        pending, self._pending = self._pending, []
+        self._flush_task = None
+
+        groups: List[Tuple[int, int, List[Tuple[int, int, asyncio.Future[bytes]]]]]
+        groups = []
+
+        for offset, size, future in sorted(pending, key=lambda item: item[0]):
+            if groups and offset - groups[-1][1] <= self._max_gap:
+                start, end, items = groups[-1]
+                items.append((offset, size, future))
+                groups[-1] = (start, max(end, offset + size), items)
+            else:
+                groups.append((offset, offset + size, [(offset, size, future)]))
+
+        await asyncio.gather(*(self._read_group(*group) for group in groups))
+
+    async def _read_group(
+        self, start: int, end: int, items: List[Tuple[int, int, asyncio.Future[bytes]]]
+    ) -> None:
+        """
+        Read merged range and slice it back to the requested ranges
+        """
+
+        try:
+            data = await self._read(start, end - start)
+        except Exception as error:
+            for _, _, future in items:
+                if not future.done():
+                    future.set_exception(error)
+            return
+
+        for offset, size, future in items:
+            if not future.done():
+                future.set_result(data[offset - start : offset - start + size])
+
+
+class _Layout(NamedTuple):
+    """
+    Sizes and structures of the fields, which depend on the byte order and on
+    whether the file is TIFF or BigTIFF
+    """
+
+    tag_struct: Struct
+    # Tag structure as numpy dtype to view the whole tags data as an array
+    tag_dtype: np.dtype
+    n_size: int
+    pointer_size: int
+
+
+def _make_layout(byte_order_fmt: str, is_bigtiff: bool) -> _Layout:
+    """
+    Build fields layout for the byte order and TIFF/BigTIFF format. For characters
+    meaning see: https://docs.python.org/3.10/library/struct.html#format-characters
+    """
+
+    pointer_fmt = "Q" if is_bigtiff else "I"  # 8 or 4 byte unsigned int
+    n_fmt = "Q" if is_bigtiff else "H"  # 8 or 2 byte unsigned int
+
+    pointer_size = calcsize(f"{byte_order_fmt}{pointer_fmt}")
+    pointer_dtype = f"{byte_order_fmt}u{pointer_size}"
+
+    return _Layout(
+        # Two SHORTs and two pointer types. For detailed tag structure see
+        # COGReader._tag_from_tag_bytes()
+        tag_struct=Struct(f"{byte_order_fmt}2H2{pointer_fmt}"),
+        tag_dtype=np.dtype(
+            [
+                ("code", f"{byte_order_fmt}u2"),
+                ("type", f"{byte_order_fmt}u2"),
+                ("length", pointer_dtype),
+                ("pointer", pointer_dtype),
+            ]
+        ),
+        n_size=calcsize(f"{byte_order_fmt}{n_fmt}"),
+        pointer_size=pointer_size,
+    )
+
+
+# Layouts for all combinations of byte order and TIFF/BigTIFF, built once on import
+LAYOUTS: Dict[Tuple[str, bool], _Layout] = {
+    (byte_order_fmt, is_bigtiff): _make_layout(byte_order_fmt, is_bigtiff)
+    for byte_order_fmt in ("<", ">")
+    for is_bigtiff in (False, True)
+}
 
 
 class COGReader:
-    _version: Literal[42, 43]
+    _version: int  # 42 for TIFF and 43 for BigTIFF
     _first_ifd_pointer: PositiveInt
     _ifds: List[IFD]
     # For characters meainng in *_fmt attributes see:
     # https://docs.python.org/3.10/library/struct.html#format-characters
     _byte_order_fmt: Literal["<", ">"]
-    _pointer_fmt: Literal["I", "Q"]
-    _n_fmt: Literal["H", "Q"]
+    # Byte order in terms of int.to_bytes() and int.from_bytes()
+    _byteorder: Literal["little", "big"]
+    _layout: _Layout
     _url: str
+    _backend: Backend
+    # Already fetched bytes by their offset in the file
+    _prefetch_cache: Dict[int, bytes]
+    _speculative_read: Optional[Tuple[int, asyncio.Task[bytes]]]
+    # Requests in progress and LRU cache of completed ones by (offset, size)
+    _inflight_reads: Dict[Tuple[int, int], asyncio.Task[bytes]]
+    _read_cache: OrderedDict[Tuple[int, int], bytes]
+    _read_cache_size: int
 
     def __init__(self, url: str):
         self._url: str = url
+        self._backend = backend_for_url(url)
         self._ifds = []
+        self._prefetch_cache = {}
+        self._speculative_read = None
+        self._inflight_reads = {}
+        self._read_cache = OrderedDict()
+        self._read_cache_size = 0
+        self._coalescer = _RangeCoalescer(self._read)
 
     def __iter__(self) -> Iterator[IFD]:
         for ifd in self._ifds:
@@ -34,21 +221,35 @@ class COGReader:
 
     async def __aenter__(self) -> COGReader:
         """
-        Establish client session and read COG's metadata
+        Open the backend and read COG's metadata
         """
 
-        self._client = ClientSession()
+        await self._backend.open()
 
         try:
+            self._prefetch_cache[0] = await self._read_raw(0, PREFETCH_SIZE)
             await self._read_header()
             await self._read_idfs()
-        except AssertionError:
-            raise ValueError("Invalid file format")
+        # BaseException to also release the backend when opening is cancelled
+        except BaseException as error:
+            await self.__aexit__()
+
+            if isinstance(error, ClientResponseError):
+                raise ValueError(
+                    f"Invalid file format: can't read {self.url}, "
+                    f"HTTP status {error.status}"
+                ) from error
+
+            raise
 
         return self
 
     async def __aexit__(self, *args: Any, **kwargs: Any) -> None:
-        await self._client.close()
+        if self._speculative_read is not None:
+            self._speculative_read[1].cancel()
+            self._speculative_read = None
+
+        await self._backend.close()
 
     @property
     def url(self) -> str:
@@ -62,50 +263,160 @@ class COGReader:
 
         return self._version == 43
 
-    @property
-    def _tag_format(self) -> str:
+    def _format(self, format_str: str) -> str:
         """
-        Return format string for struct.unpack(): two SHORTs and two pointer types.
-        For detailed tag structure see _tag_from_tag_bytes()
+        Add byte-order endian to struct format string
         """
 
-        return self._format(f"2H2{self._pointer_fmt}")
+        return f"{self._byte_order_fmt}{format_str}"
 
-    def _format(self, format_str: str) -> str:
+    def _read_prefetched(self, offset: int, size: int) -> Optional[bytes]:
         """
-        Add byte-order endian to struct format string
+        Get the data within the specific byte range from already fetched bytes.
+        Return None if the range isn't fully inside any of them
         """
 
-        return f"{self._byte_order_fmt}{format_str}"
+        for start, data in self._prefetch_cache.items():
+            if start <= offset and offset + size <= start + len(data):
+                return data[offset - start : offset - start + size]
+
+        return None
 
     async def _read(self, offset: int, size: int) -> bytes:
         """
-        Get the data from URL within the specific byte range
+        Get the data within the specific byte range. Use prefetched bytes if the range
+        is fully inside them or the result of the same request if it was already
+        made or is in progress, otherwise request it from URL
         """
 
-        header = {"Range": f"bytes={offset}-{offset + size - 1}"}
+        data = self._read_prefetched(offset, size)
 
-        async with self._client.get(self.url, headers=header) as response:
-            assert response.ok
-            return await response.read()
+        if data is not None:
+            return data
 
-    async def _read_header(self) -> None:
+        key = (offset, size)
+
+        if key in self._read_cache:
+            self._read_cache.move_to_end(key)
+            return self._read_cache[key]
+
+        if key not in self._inflight_reads:
+            task = asyncio.ensure_future(self._read_raw(offset, size))
+            task.add_done_callback(lambda _: self._inflight_reads.pop(key, None))
+            self._inflight_reads[key] = task
+
+        # Shield the shared request, so cancelling one of the callers doesn't cancel
+        # it for the others
+        data = await asyncio.shield(self._inflight_reads[key])
+        self._cache_read(key, data)
+
+        return data
+
+    def _cache_read(self, key: Tuple[int, int], data: bytes) -> None:
         """
-        Reads TIFF header. See functions docstrings to get it's structure
+        Keep the result of the request in the LRU cache and evict the least recently
+        used ones if the cache exceeds READ_CACHE_SIZE
         """
 
-        await self._read_first_header()
+        if key in self._read_cache or len(data) > READ_CACHE_SIZE:
+            return
 
-        if self.is_bigtiff:
-            self._pointer_fmt = "Q"  # 8 byte unsigned int
-            self._n_fmt = "Q"  # 8 byte unsigned int
+        self._read_cache[key] = data
+        self._read_cache_size += len(data)
+
+        while self._read_cache_size > READ_CACHE_SIZE:
+            _, evicted = self._read_cache.popitem(last=False)
+            self._read_cache_size -= len(evicted)
+
+    async def _read_raw(self, offset: int, size: int) -> bytes:
+        """
+        Get the data from the backend within the specific byte range
+        """
+
+        return await self._backend.read(offset, size)
+
+    async def _read_ahead(self, offset: int, size: int, min_size: int) -> memoryview:
+        """
+        Get at least min_size and up to size bytes starting from offset.
+        Use already fetched bytes if they are enough, otherwise read the whole range
+        and keep it in the prefetch cache, so following reads inside it are served
+        from memory. Return memoryview to avoid copying fetched bytes
+        """
+
+        for start, data in self._prefetch_cache.items():
+            if start <= offset and offset + min_size <= start + len(data):
+                return memoryview(data)[offset - start : offset - start + size]
+
+        data = await self._coalescer.queue(offset, size)
+        self._prefetch_cache[offset] = data
+
+        return memoryview(data)
+
+    async def _read_speculative(self, offset: int, size: int) -> bytes:
+        """
+        Get the data from URL within the byte range which may be not needed at all,
+        e.g. lie after the end of file. Return empty bytes on failure.
+        The range is queued with other reads, so it's merged with the adjacent ones
+        """
+
+        try:
+            return await self._coalescer.queue(offset, size)
+        except (ClientError, OSError):
+            return b""
+
+    def _start_speculative_read(self, offset: int) -> None:
+        """
+        Start reading the region which is likely to contain the next IFD
+        """
+
+        # IFDs are small, so the one starting inside fetched bytes most likely fits
+        if self._read_prefetched(offset, 1) is not None:
+            return
+
+        task = asyncio.create_task(self._read_speculative(offset, IFDS_READ_SIZE))
+        self._speculative_read = (offset, task)
+
+    async def _finish_speculative_read(self, pointer: int) -> None:
+        """
+        Keep speculatively read data if it contains the next IFD, discard it otherwise
+        """
 
-            await self._read_bigtiff_second_header()
+        if self._speculative_read is None:
+            return
+
+        offset, task = self._speculative_read
+        self._speculative_read = None
+
+        if offset <= pointer < offset + IFDS_READ_SIZE:
+            data = await task
+
+            if data:
+                self._prefetch_cache[offset] = data
         else:
-            self._pointer_fmt = "I"  # 4 byte unsigned int
-            self._n_fmt = "H"  # 2 byte unsigned int
+            task.cancel()
+
+    async def _read_header(self) -> None:
+        """
+        Reads TIFF header. See parsers docstrings to get it's structure.
+        Header is read at once, since its size is known only after parsing
+        the first part of it
+        """
+
+        header = await self._read(0, HEADER_SIZE)
+
+        self._parse_first_header(header)
+
+        # Files shorter than the header are served partially, check the size before
+        # parsing the rest, so missing bytes aren't taken for zeros
+        if len(header) < (HEADER_SIZE if self.is_bigtiff else TIFF_HEADER_SIZE):
+            raise ValueError("Invalid file format: truncated header")
 
-            await self._read_second_header()
+        self._layout = LAYOUTS[(self._byte_order_fmt, self.is_bigtiff)]
+
+        if self.is_bigtiff:
+            self._parse_bigtiff_second_header(header)
+        else:
+            self._parse_second_header(header)
 
     async def _read_idfs(self) -> None:
         """
@@ -114,13 +425,61 @@ class COGReader:
         """
 
         pointer = self._first_ifd_pointer
+        headers = []
+        batch: List[memoryview] = []
+        parsing = []
+        loop = asyncio.get_running_loop()
 
         while pointer > 0:
-            ifd = await self._read_ifd(pointer)
+            n_tags, next_ifd_pointer, tags_data = await self._read_ifd(pointer)
+            headers.append((pointer, n_tags, next_ifd_pointer))
+            batch.append(tags_data)
+
+            # Parse tags of IFDs read so far in a thread while the next IFD is fetched.
+            # IFDs served from already fetched bytes are parsed together
+            next_ifd_prefetched = self._read_prefetched(
+                next_ifd_pointer, self._layout.n_size
+            )
+
+            if next_ifd_pointer > 0 and next_ifd_prefetched is None:
+                parsing.append(loop.run_in_executor(None, self._tags_from_data, batch))
+                batch = []
+
+            await self._prefetch_ifd(next_ifd_pointer)
+            pointer = next_ifd_pointer
+
+        parsing.append(loop.run_in_executor(None, self._tags_from_data, batch))
+        batches_tags = await asyncio.gather(*parsing)
+        ifds_tags = [tags for batch_tags in batches_tags for tags in batch_tags]
+
+        for (pointer, n_tags, next_ifd_pointer), tags in zip(headers, ifds_tags):
+            ifd = IFD(
+                pointer=pointer,
+                n_tags=n_tags,
+                next_ifd_pointer=next_ifd_pointer,
+                tags={tag.name: tag for tag in tags},
+            )
             self._ifds.append(ifd)
-            pointer = ifd.next_ifd_pointer
 
-    async def _read_first_header(self) -> None:
+        # Blocks fetched ahead for IFDs aren't needed once they are parsed. Keep only
+        # the beginning of the file, so memory and lookups in the prefetch cache don't
+        # grow with the number of IFDs
+        self._prefetch_cache = {
+            offset: data for offset, data in self._prefetch_cache.items() if offset == 0
+        }
+
+    async def _prefetch_ifd(self, pointer: int) -> None:
+        """
+        Make sure the beginning of IFD is fetched. Overview IFDs of COG usually follow
+        each other, so read a larger block starting from it if it's not
+        """
+
+        await self._finish_speculative_read(pointer)
+
+        if pointer > 0:
+            await self._read_ahead(pointer, IFDS_READ_SIZE, self._layout.n_size)
+
+    def _parse_first_header(self, header: bytes) -> None:
         """
         First header structure
 
@@ -134,27 +493,25 @@ class COGReader:
         +------+-----+------------------------------------------------+
         """
 
-        POINTER = 0
-
-        data = await self._read(POINTER, 4)
-
-        # Read first two bytes and skip the last two
-        (first_bytest,) = unpack("2s2x", data)
+        first_bytes = header[:2]
 
         # https://docs.python.org/3.8/library/struct.html#byte-order-size-and-alignment
-        if first_bytest == b"II":
+        if first_bytes == b"II":
             self._byte_order_fmt = "<"
-        elif first_bytest == b"MM":
+            self._byteorder = "little"
+        elif first_bytes == b"MM":
             self._byte_order_fmt = ">"
+            self._byteorder = "big"
         else:
-            raise AssertionError
+            raise ValueError("Invalid file format: unknown byte order")
 
         # Skip first two bytes and read the last two as SHORT
-        (self._version,) = unpack(self._format("2xH"), data)
+        self._version = int.from_bytes(header[2:4], self._byteorder)
 
-        assert self._version in (42, 43)
+        if self._version not in (42, 43):
+            raise ValueError(f"Invalid file format: unknown version {self._version}")
 
-    async def _read_second_header(self) -> None:
+    def _parse_second_header(self, header: bytes) -> None:
         """
         Second header structure for TIFF.
         It's pointer is 4 since the first 4 bystes are for the first header
@@ -167,12 +524,11 @@ class COGReader:
         """
 
         POINTER = 4
-        format_str = self._format(self._pointer_fmt)
 
-        data = await self._read(POINTER, calcsize(format_str))
-        (self._first_ifd_pointer,) = unpack(format_str, data)
+        data = header[POINTER : POINTER + self._layout.pointer_size]
+        self._first_ifd_pointer = int.from_bytes(data, self._byteorder)
 
-    async def _read_bigtiff_second_header(self) -> None:
+    def _parse_bigtiff_second_header(self, header: bytes) -> None:
         """
         Second header structure for BigTIFF
         It's pointer is 4 since the first 4 bystes are for the first header
@@ -189,16 +545,15 @@ class COGReader:
         """
 
         POINTER = 4
-        format_str = self._format("HHQ")
-
-        data = await self._read(POINTER, calcsize(format_str))
 
-        bytesize, placeholder, self._first_ifd_pointer = unpack(format_str, data)
+        bytesize, placeholder, self._first_ifd_pointer = unpack_from(
+            self._format("HHQ"), header, POINTER
+        )
 
-        assert bytesize == 8
-        assert placeholder == 0
+        if bytesize != 8 or placeholder != 0:
+            raise ValueError("Invalid file format: invalid BigTIFF header")
 
-    async def _read_ifd(self, ifd_pointer: int) -> IFD:
+    async def _read_ifd(self, ifd_pointer: int) -> Tuple[int, int, memoryview]:
         """
         IFD structure. It's pointer is `ifd_pointer`
 
@@ -219,44 +574,75 @@ class COGReader:
         +------------+------------+------------------------------------------+
         """
 
-        n_format_str = self._format(self._n_fmt)
+        n_size = self._layout.n_size
+        tag_size = self._layout.tag_struct.size
+        size = n_size + MAX_EXPECTED_TAGS * tag_size + self._layout.pointer_size
+
+        # Read nubmer of tags in the IFD together with tags data of a typical IFD
+        data = await self._read_ahead(ifd_pointer, size, n_size)
+
+        # Local files are read partially past their end, so check the size to not
+        # take missing bytes for zeros
+        if len(data) < n_size:
+            raise ValueError(f"Invalid file format: IFD {ifd_pointer} is out of file")
+
+        n_tags = int.from_bytes(data[:n_size], self._byteorder)
 
-        # Read nubmer of tags in the IFD
-        n_data = await self._read(ifd_pointer, calcsize(n_format_str))
-        (n_tags,) = unpack(n_format_str, n_data)
+        tags_len = n_tags * tag_size
+        ifd_size = n_size + tags_len + self._layout.pointer_size
 
-        tags_len = n_tags * calcsize(self._tag_format)
-        tags_pointer = ifd_pointer + calcsize(n_format_str)
-        format_str = self._format(f"{tags_len}s{self._pointer_fmt}")
+        # In COGs the next IFD usually follows the current one, so read that region
+        # while the current IFD is being read and parsed
+        self._start_speculative_read(ifd_pointer + ifd_size)
 
-        # Read tags data and pointer to next IFD
-        data = await self._read(tags_pointer, calcsize(format_str))
+        # Read the rest of tags data and pointer to next IFD if IFD is bigger
+        if len(data) < ifd_size:
+            rest_pointer = ifd_pointer + len(data)
+            rest = await self._coalescer.queue(rest_pointer, ifd_size - len(data))
+            data = memoryview(bytes(data) + rest)
 
-        tags_data, next_ifd_pointer = unpack(format_str, data)
-        tags = self._tags_from_data(n_tags, tags_data)
+            if len(data) < ifd_size:
+                raise ValueError(f"Invalid file format: IFD {ifd_pointer} is truncated")
 
-        return IFD(
-            pointer=ifd_pointer,
-            n_tags=n_tags,
-            next_ifd_pointer=next_ifd_pointer,
-            tags={tag.name: tag for tag in tags},
+        # Slice memoryview to pass tags data to the parser without copying the whole
+        # fetched block
+        tags_data = data[n_size : n_size + tags_len]
+        next_ifd_pointer = int.from_bytes(
+            data[n_size + tags_len : ifd_size], self._byteorder
         )
 
-    def _tags_from_data(self, n_tags: int, tags_bytes: bytes) -> Iterator[Tag]:
+        return n_tags, next_ifd_pointer, tags_data
+
+    def _tags_from_data(self, ifds_tags_data: List[memoryview]) -> List[List[Tag]]:
         """
-        Split data into tag-sized buffers and parse them
+        View tags data of IFDs as a single array of tag fields and create tags from
+        its valid rows. Fields Tag can't be made of (unsupported data type, no values
+        or zero pointer) are filtered out for all IFDs at once.
+        Tags data of a single IFD is viewed without copying, of several IFDs it's
+        joined first
         """
 
-        size = calcsize(self._tag_format)
+        if len(ifds_tags_data) == 1:
+            tags_bytes: Union[memoryview, bytes] = ifds_tags_data[0]
+        else:
+            tags_bytes = b"".join(ifds_tags_data)
+
+        tag_dtype = self._layout.tag_dtype
+        fields = np.frombuffer(tags_bytes, dtype=tag_dtype)
+        ifd_indices = np.repeat(
+            np.arange(len(ifds_tags_data)),
+            [len(tags_data) // tag_dtype.itemsize for tags_data in ifds_tags_data],
+        )
 
-        # Split tags_bytes into n tag-sized chuncks
-        for tag_bytes in unpack(n_tags * f"{size}s", tags_bytes):
-            try:
-                tag = self._tag_from_tag_bytes(tag_bytes)
-            except ValueError:
-                continue
+        supported = np.isin(fields["type"], SUPPORTED_TAG_TYPES)
+        valid = supported & (fields["length"] > 0) & (fields["pointer"] > 0)
 
-            yield tag
+        ifds_tags: List[List[Tag]] = [[] for _ in ifds_tags_data]
+
+        for idx, tag_fields in zip(ifd_indices[valid].tolist(), fields[valid].tolist()):
+            ifds_tags[idx].append(self._make_tag(*tag_fields))
+
+        return ifds_tags
 
     def _tag_from_tag_bytes(self, tag_bytes: bytes) -> Tag:
         """
@@ -276,32 +662,45 @@ class COGReader:
         +--------------+------------+-----------------------------------+
         """
 
-        code, tag_type, length, pointer = unpack(self._tag_format, tag_bytes)
+        return self._make_tag(*self._layout.tag_struct.unpack(tag_bytes))
+
+    def _make_tag(self, code: int, type_code: int, length: int, pointer: int) -> Tag:
+        """
+        Create tag from already unpacked fields. See _tag_from_tag_bytes()
+        """
 
         tag: Tag
+        tag_code = TagCode.validate(code)
+        tag_type = TagType.validate(type_code)
 
         if tag_type == 2:  # ASCII string
-            tag = StringTag(code=code, length=length, data_pointer=pointer)
+            tag = StringTag(code=tag_code, length=length, data_pointer=pointer)
 
         elif tag_type == 7:  # bytes
-            tag = BytesTag(code=code, length=length, data_pointer=pointer)
+            tag = BytesTag(code=tag_code, length=length, data_pointer=pointer)
 
         elif tag_type in (5, 10):  # fractions
             tag = FractionsTag(
-                code=code, type=tag_type, length=length, data_pointer=pointer
+                code=tag_code, type=tag_type, length=length, data_pointer=pointer
             )
 
         # GeoKeyDirectoryTag must be list tag because parsing it relies on indexing
-        elif TagCode(code).is_list or length > 1:
-            tag = ListTag(code=code, type=tag_type, length=length, data_pointer=pointer)
+        elif tag_code.is_list or length > 1:
+            tag = ListTag(
+                code=tag_code, type=tag_type, length=length, data_pointer=pointer
+            )
 
         else:
-            tag = NumberTag(code=code, type=tag_type, data_pointer=pointer)
+            tag = NumberTag(code=tag_code, type=tag_type, data_pointer=pointer)
+
+        data_size = TAG_TYPE_SIZES[tag_type] * length
 
         # If tag data type fits into it's data pointer size, then last bytes contain
-        # data, not it's pointer
-        if tag.data_size <= calcsize(self._pointer_fmt):
-            data = pack(self._pointer_fmt, pointer)[: tag.data_size]
+        # data, not it's pointer. Data is left-justified in file's byte order
+        pointer_size = self._layout.pointer_size
+
+        if data_size <= pointer_size:
+            data = pointer.to_bytes(pointer_size, self._byteorder)[:data_size]
             tag.parse_data(data, self._byte_order_fmt)
             tag.data_pointer = None
 
@@ -314,16 +713,18 @@ class COGReader:
         """
 
         if tag.data_pointer:
-            data = await self._read(tag.data_pointer, tag.data_size)
+            data = await self._coalescer.queue(tag.data_pointer, tag.data_size)
             tag.parse_data(data, self._byte_order_fmt)
 
     async def _fill_ifd_with_data(self, ifd: IFD) -> None:
         """
-        Read data for all tags within IFD. Parse GeoKeys tags
+        Read data for all tags within IFD. Parse GeoKeys tags.
+        Tags data is requested concurrently, so close ranges are read together
         """
 
-        for tag in ifd.tags.values():
-            await self._fill_tag_with_data(tag)
+        await asyncio.gather(
+            *(self._fill_tag_with_data(tag) for tag in ifd.tags.values())
+        )
 
         ifd.parse_geokeys()
 
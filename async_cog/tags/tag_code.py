@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from functools import lru_cache
 from typing import Any, Iterator
 
 
@@ -13,7 +14,10 @@ class TagCode(int):
     def __get_validators__(cls) -> Iterator[Any]:
         yield cls.validate
 
+    # Tags with the same code share a single instance instead of keeping a copy
+    # of its attributes per tag
     @classmethod
+    @lru_cache(maxsize=None)
     def validate(cls, code: int) -> TagCode:
         return cls(code)
 
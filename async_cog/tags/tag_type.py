@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from functools import lru_cache
+from struct import calcsize
 from typing import Any, Iterator
 
 
@@ -12,7 +14,9 @@ class TagType(int):
     def __get_validators__(cls) -> Iterator[Any]:
         yield cls.validate
 
+    # Shared instances, see TagCode.validate()
     @classmethod
+    @lru_cache(maxsize=None)
     def validate(cls, type_code: int) -> TagType:
         return cls(type_code)
 
@@ -42,3 +46,6 @@ TAG_TYPES = {
     12: "d",  # DOUBLE
     16: "Q",  # LONG8
 }
+
+# Size in bytes of a single value of each type
+TAG_TYPE_SIZES = {type_code: calcsize(fmt) for type_code, fmt in TAG_TYPES.items()}
@@ -0,0 +1,89 @@
+import os
+from asyncio import ensure_future, gather, sleep
+from pathlib import Path
+
+from pytest import mark, raises
+
+from async_cog import COGReader
+from async_cog.backends import Backend, FileBackend, HTTPBackend, backend_for_url
+
+MOCK_DATA = (Path(__file__).parent / "mock_data").resolve()
+
+
+@mark.asyncio
+async def test_not_implemented() -> None:
+    backend = Backend()
+
+    with raises(NotImplementedError):
+        await backend.open()
+
+    with raises(NotImplementedError):
+        await backend.read(0, 8)
+
+    with raises(NotImplementedError):
+        await backend.close()
+
+
+def test_backend_for_url() -> None:
+    assert isinstance(backend_for_url("https://example.com/cog.tif"), HTTPBackend)
+    assert isinstance(backend_for_url("cog.tif"), HTTPBackend)
+
+    backend = backend_for_url((MOCK_DATA / "cog.tif").as_uri())
+
+    assert isinstance(backend, FileBackend)
+    assert backend._path == str(MOCK_DATA / "cog.tif")
+
+
+@mark.asyncio
+async def test_http_backend_connector(mocked_reader) -> None:
+    async with mocked_reader("cog.tif") as reader:
+        assert reader._backend._client.connector.limit_per_host == 32
+
+
+@mark.asyncio
+async def test_file_backend_read() -> None:
+    backend = FileBackend(str(MOCK_DATA / "cog.tif"))
+    await backend.open()
+
+    assert await backend.read(0, 4) == b"II*\x00"
+    assert await backend.read(1 << 30, 4) == b""
+
+    await backend.close()
+
+
+@mark.asyncio
+async def test_file_backend_read_without_pread(monkeypatch) -> None:
+    monkeypatch.delattr(os, "pread")
+
+    backend = FileBackend(str(MOCK_DATA / "cog.tif"))
+    await backend.open()
+
+    first, second = await gather(backend.read(2, 2), backend.read(0, 2))
+
+    assert (first, second) == (b"*\x00", b"II")
+
+    await backend.close()
+
+
+@mark.asyncio
+async def test_file_backend_close_waits_for_reads() -> None:
+    backend = FileBackend(str(MOCK_DATA / "cog.tif"))
+    await backend.open()
+
+    read = ensure_future(backend.read(0, 4))
+    await sleep(0)
+    await backend.close()
+
+    assert await read == b"II*\x00"
+
+
+@mark.asyncio
+async def test_read_local_file(mocked_reader) -> None:
+    async with mocked_reader("cog.tif") as http_reader:
+        async with COGReader((MOCK_DATA / "cog.tif").as_uri()) as file_reader:
+            assert file_reader._ifds == http_reader._ifds
+
+            file_tile = await file_reader.get_tile_image(0, 0, 0)
+            http_tile = await http_reader.get_tile_image(0, 0, 0)
+
+            assert (file_tile == http_tile).all()
@@ -1,13 +1,26 @@
 # Thanks to mapbox/COGDumper for the mock data
+from asyncio import CancelledError, gather
 from fractions import Fraction
+from pathlib import Path
 from re import escape
+from struct import pack
+from typing import List, Tuple
 
 import numpy as np
+from aiohttp import ClientError
+from aioresponses import aioresponses
 from pytest import mark, raises
 
-from async_cog import COGReader
+from async_cog import COGReader, cog_reader
+from async_cog.cog_reader import (
+    HEADER_SIZE,
+    IFDS_READ_SIZE,
+    LAYOUTS,
+    PREFETCH_SIZE,
+    _RangeCoalescer,
+)
 from async_cog.ifd import IFD
-from async_cog.tags import BytesTag, ListTag, NumberTag, StringTag
+from async_cog.tags import BytesTag, ListTag, NumberTag, StringTag, Tag
 
 
 def test_constructor() -> None:
@@ -17,6 +30,16 @@ def test_constructor() -> None:
     assert reader.url == url
 
 
+def test_layouts() -> None:
+    tiff_layout = LAYOUTS[("<", False)]
+    bigtiff_layout = LAYOUTS[(">", True)]
+
+    assert tiff_layout.tag_struct.size == tiff_layout.tag_dtype.itemsize == 12
+    assert (tiff_layout.n_size, tiff_layout.pointer_size) == (2, 4)
+    assert bigtiff_layout.tag_struct.size == bigtiff_layout.tag_dtype.itemsize == 20
+    assert (bigtiff_layout.n_size, bigtiff_layout.pointer_size) == (8, 8)
+
+
 @mark.asyncio
 async def test_read_header(mocked_reader) -> None:
     async with mocked_reader("cog.tif") as reader:
@@ -47,6 +70,286 @@ async def test_read_invalid_endian(mocked_reader) -> None:
         await mocked_reader("invalid_endian.tif").__aenter__()
 
 
+@mark.asyncio
+@mark.parametrize("header", [b"II*\x00", b"II+\x00" + pack("<HH", 8, 0)])
+async def test_read_truncated_header(header: bytes, tmp_path) -> None:
+    path = tmp_path / "truncated.tif"
+    path.write_bytes(header)
+
+    with raises(ValueError, match="Invalid file format: truncated header"):
+        await COGReader(path.as_uri()).__aenter__()
+
+
+@mark.asyncio
+@mark.parametrize(
+    "data, message",
+    [
+        (b"II*\x00" + pack("<I", 10**6), "IFD 1000000 is out of file"),
+        (b"II*\x00" + pack("<IHHHII", 8, 2, 256, 3, 1, 64), "IFD 8 is truncated"),
+    ],
+)
+async def test_read_truncated_ifd(data: bytes, message: str, tmp_path) -> None:
+    path = tmp_path / "truncated.tif"
+    path.write_bytes(data)
+
+    with raises(ValueError, match=f"Invalid file format: {message}"):
+        await COGReader(path.as_uri()).__aenter__()
+
+
+@mark.asyncio
+async def test_read_invalid_bigtiff_header() -> None:
+    reader = COGReader("http://example.com")
+    reader._prefetch_cache[0] = b"II+\x00" + pack("<HHQ", 4, 0, 16)
+
+    with raises(ValueError, match="Invalid file format: invalid BigTIFF header"):
+        await reader._read_header()
+
+
+@mark.asyncio
+async def test_read_not_found() -> None:
+    with aioresponses() as mocked_response:
+        mocked_response.get("cog.tif", status=404)
+
+        with raises(ValueError, match="Invalid file format: .* HTTP status 404"):
+            await COGReader("cog.tif").__aenter__()
+
+
+@mark.asyncio
+async def test_open_cancelled(mocked_reader, monkeypatch) -> None:
+    reader = mocked_reader("cog.tif")
+
+    async def _read_header() -> None:
+        raise CancelledError
+
+    monkeypatch.setattr(reader, "_read_header", _read_header)
+
+    with raises(CancelledError):
+        await reader.__aenter__()
+
+    assert reader._backend._client.closed
+
+
+def log_requests(reader: COGReader, monkeypatch) -> List[Tuple[int, int]]:
+    """
+    Record byte ranges requested by the reader from URL
+    """
+
+    read_raw = reader._read_raw
+    requests = []
+
+    async def _read_raw(offset: int, size: int) -> bytes:
+        requests.append((offset, size))
+        return await read_raw(offset, size)
+
+    monkeypatch.setattr(reader, "_read_raw", _read_raw)
+
+    return requests
+
+
+def write_ifds_chain(path: Path, first_ifd_pointer: int, n_ifds: int) -> None:
+    """
+    Write TIFF with IFDs of 10 tags following each other from first_ifd_pointer
+    """
+
+    ifd_size = 2 + 10 * 12 + 4
+    data = bytearray(first_ifd_pointer + n_ifds * ifd_size)
+    data[:8] = b"II*\x00" + pack("<I", first_ifd_pointer)
+
+    for idx in range(n_ifds):
+        pointer = first_ifd_pointer + idx * ifd_size
+        next_ifd_pointer = pointer + ifd_size if idx < n_ifds - 1 else 0
+        tags = b"".join(pack("<HHII", 256 + code, 3, 1, 1) for code in range(10))
+        data[pointer : pointer + ifd_size] = (
+            pack("<H", 10) + tags + pack("<I", next_ifd_pointer)
+        )
+
+    path.write_bytes(data)
+
+
+@mark.asyncio
+async def test_speculative_read_merged(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "chain.tif"
+    # The fourth IFD is split by the end of the prefetched bytes
+    write_ifds_chain(path, 16000, 5)
+    reader = COGReader(path.as_uri())
+    requests = log_requests(reader, monkeypatch)
+
+    async with reader:
+        assert len(reader._ifds) == 5
+        # The rest of the split IFD and the speculative read after it are adjacent
+        assert requests[:2] == [
+            (0, PREFETCH_SIZE),
+            (16384, 120 + IFDS_READ_SIZE),
+        ]
+
+
+@mark.asyncio
+async def test_read_metadata_from_prefetch(mocked_reader, monkeypatch) -> None:
+    reader = mocked_reader("cog.tif")
+    requests = log_requests(reader, monkeypatch)
+
+    async with reader:
+        assert requests == [(0, PREFETCH_SIZE)]
+
+
+@mark.asyncio
+async def test_read_header_at_once(mocked_reader, monkeypatch) -> None:
+    reader = mocked_reader("BigTIFF.tif")
+    requests = log_requests(reader, monkeypatch)
+
+    await reader._backend.open()
+    await reader._read_header()
+    await reader._backend.close()
+
+    assert reader.is_bigtiff
+    assert requests == [(0, HEADER_SIZE)]
+
+
+@mark.asyncio
+async def test_read_ifds_ahead(mocked_reader, monkeypatch) -> None:
+    reader = mocked_reader("BigTIFF.tif")
+    requests = log_requests(reader, monkeypatch)
+
+    async with reader:
+        assert len(reader._ifds) == 5
+        # Overview IFDs are read from the block fetched starting from the second one
+        assert requests == [(0, PREFETCH_SIZE), (196880, IFDS_READ_SIZE)]
+        # Only the beginning of the file is kept once IFDs are parsed
+        assert list(reader._prefetch_cache) == [0]
+
+
+@mark.asyncio
+async def test_parse_tags_in_batches(mocked_reader, monkeypatch) -> None:
+    reader = mocked_reader("BigTIFF.tif")
+    tags_from_data = reader._tags_from_data
+    batches = []
+
+    def _tags_from_data(ifds_tags_data: List[memoryview]) -> List[List[Tag]]:
+        batches.append(len(ifds_tags_data))
+        return tags_from_data(ifds_tags_data)
+
+    monkeypatch.setattr(reader, "_tags_from_data", _tags_from_data)
+
+    async with reader:
+        assert reader._ifds[0].tags and reader._ifds[-1].tags
+        # The first IFD is parsed while the block with overview IFDs is fetched,
+        # overview IFDs are parsed together
+        assert batches == [1, 4]
+
+
+@mark.asyncio
+async def test_read_contiguous_ifds_ahead(tmp_path, monkeypatch) -> None:
+    path = tmp_path / "chain.tif"
+    # IFDs from 16000 to 41200 cross the end of the prefetched bytes
+    write_ifds_chain(path, 16000, 200)
+    reader = COGReader(path.as_uri())
+    requests = log_requests(reader, monkeypatch)
+
+    async with reader:
+        assert len(reader._ifds) == 200
+        # IFDs after the prefetched bytes are read with the rest of the split one
+        assert requests == [(0, PREFETCH_SIZE), (16384, 120 + IFDS_READ_SIZE)]
+
+
+@mark.asyncio
+async def test_read_ifd_with_many_tags(mocked_reader, monkeypatch) -> None:
+    monkeypatch.setattr(cog_reader, "MAX_EXPECTED_TAGS", 4)
+
+    async with mocked_reader("BigTIFF.tif") as reader:
+        assert [ifd.n_tags for ifd in reader._ifds] == [12, 13, 13, 13, 13]
+        assert len(reader._ifds[1].tags) == 13
+
+
+@mark.asyncio
+async def test_speculative_read(mocked_reader) -> None:
+    async with mocked_reader("BigTIFF.tif") as reader:
+        reader._start_speculative_read(300000)
+        await reader._finish_speculative_read(300100)
+
+        assert len(reader._prefetch_cache[300000]) == IFDS_READ_SIZE
+
+        reader._start_speculative_read(310000)
+        await reader._finish_speculative_read(200000)
+
+        assert 310000 not in reader._prefetch_cache
+
+        reader._start_speculative_read(320000)
+
+    assert reader._speculative_read is None
+
+
+@mark.asyncio
+async def test_speculative_read_failed(mocked_reader, monkeypatch) -> None:
+    async with mocked_reader("BigTIFF.tif") as reader:
+
+        async def _read_raw(offset: int, size: int) -> bytes:
+            raise ClientError
+
+        monkeypatch.setattr(reader, "_read_raw", _read_raw)
+
+        reader._start_speculative_read(300000)
+        await reader._finish_speculative_read(300000)
+
+        assert 300000 not in reader._prefetch_cache
+
+
+@mark.asyncio
+async def test_read_deduplicated(mocked_reader, monkeypatch) -> None:
+    async with mocked_reader("BigTIFF.tif") as reader:
+        requests = log_requests(reader, monkeypatch)
+
+        first, second = await gather(reader._read(300000, 8), reader._read(300000, 8))
+        third = await reader._read(300000, 8)
+
+        assert first == second == third
+        assert requests == [(300000, 8)]
+
+
+@mark.asyncio
+async def test_read_cache_eviction(mocked_reader, monkeypatch) -> None:
+    monkeypatch.setattr(cog_reader, "READ_CACHE_SIZE", 16)
+
+    async with mocked_reader("BigTIFF.tif") as reader:
+        await reader._read(300000, 8)
+        await reader._read(300100, 8)
+        await reader._read(300200, 8)
+        await reader._read(300300, 32)
+
+        assert list(reader._read_cache) == [(300100, 8), (300200, 8)]
+
+
+@mark.asyncio
+async def test_range_coalescer() -> None:
+    data = bytes(range(256))
+    requests = []
+
+    async def read(offset: int, size: int) -> bytes:
+        requests.append((offset, size))
+        return data[offset : offset + size]
+
+    coalescer = _RangeCoalescer(read, max_gap=16)
+
+    results = await gather(
+        coalescer.queue(20, 4),
+        coalescer.queue(0, 8),
+        coalescer.queue(100, 2),
+    )
+
+    assert results == [data[20:24], data[0:8], data[100:102]]
+    assert requests == [(0, 24), (100, 2)]
+
+
+@mark.asyncio
+async def test_range_coalescer_error() -> None:
+    async def read(offset: int, size: int) -> bytes:
+        raise ValueError("Can't read")
+
+    coalescer = _RangeCoalescer(read)
+
+    with raises(ValueError, match="Can't read"):
+        await coalescer.queue(0, 8)
+
+
 @mark.asyncio
 async def test_read_ifds(mocked_reader) -> None:
     tags = [
@@ -243,6 +546,31 @@ async def test_read_ifds_big_tiff(mocked_reader) -> None:
     ]
 
 
+@mark.asyncio
+async def test_tag_from_tag_bytes(mocked_reader) -> None:
+    async with mocked_reader("cog.tif") as reader:
+        tag = reader._tag_from_tag_bytes(pack("<HHII", 256, 3, 1, 64))
+
+        assert tag == NumberTag(code=256, type=3, length=1, value=64)
+
+
+@mark.asyncio
+async def test_tags_from_data(mocked_reader) -> None:
+    async with mocked_reader("cog.tif") as reader:
+        first_ifd = pack("<HHII", 256, 3, 1, 64) + pack("<HHII", 257, 13, 1, 64)
+        third_ifd = pack("<HHII", 257, 3, 1, 32)
+
+        ifds_tags = reader._tags_from_data(
+            [memoryview(first_ifd), memoryview(b""), memoryview(third_ifd)]
+        )
+
+        assert ifds_tags == [
+            [NumberTag(code=256, type=3, length=1, value=64)],
+            [],
+            [NumberTag(code=257, type=3, length=1, value=32)],
+        ]
+
+
 @mark.asyncio
 async def test_fill_tag_data(mocked_reader) -> None:
     async with mocked_reader("BigTIFF.tif") as reader:
@@ -270,7 +598,18 @@ async def test_tag_ascii(mocked_reader) -> None:
     async with mocked_reader("be_cog.tif") as reader:
         tag = reader._ifds[1].tags["NewSubfileType"]
         await reader._fill_tag_with_data(tag)
-        assert tag.value == "test"
+        # Inline ASCII data is stored as is, regardless of the byte order
+        assert tag.value == "tset"
+
+
+@mark.asyncio
+async def test_tag_inline_big_endian(mocked_reader) -> None:
+    async with mocked_reader("be_cog.tif") as reader:
+        ifd = reader._ifds[0]
+
+        assert ifd["ImageWidth"] == 64
+        assert ifd["Compression"] == 7
+        assert ifd["TileOffsets"] == [8]
 
 
 @mark.asyncio
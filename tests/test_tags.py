@@ -35,3 +35,16 @@ def test_not_imlemented() -> None:
 
     with raises(NotImplementedError):
         tag.parse_data(b"", "<")
+
+
+def test_unsupported_type() -> None:
+    with raises(ValueError, match="Tag with type 13 is not supported"):
+        Tag(code=254, type=13, length=1)
+
+
+def test_tag_code_and_type_shared() -> None:
+    first = Tag(code=256, type=3, length=1)
+    second = Tag(code=256, type=3, length=1)
+
+    assert first.code is second.code
+    assert first.type is second.type